@@ -1,30 +1,124 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
 from zxcvbn import zxcvbn
-import requests
-import socket
+from collections import deque
 from urllib.parse import urlparse
+import hashlib
+import hmac
+import json
 import os
+import queue
+import time
+
+from metrics import Metrics
+from phishing_index import PhishingDB
+from result_cache import LRUCache, ResultCache, normalize_url
+from url_heuristics import HeuristicEngine
+from url_tracer import ERROR_BUSY, RedirectTracer
 
 app = Flask(__name__)
+# 일괄 검사 업로드 등 요청 본문 크기 제한 (2MB)
+app.config['MAX_CONTENT_LENGTH'] = 2 * 1024 * 1024
+
+# 단계별 지연 시간 측정 (응답의 Server-Timing 헤더, /metrics)
+# METRICS_DIR 을 지정하면 모든 워커의 히스토그램을 합쳐 보여줍니다 (gunicorn.conf.py 에서 기본값 설정).
+metrics = Metrics(
+    directory=os.environ.get('METRICS_DIR'),
+    flush_interval=float(os.environ.get('METRICS_FLUSH_INTERVAL', 1))
+)
 
 # 피싱 데이터베이스 로드
-phishing_db = set()
+# 워커마다 set 을 만드는 대신, 미리 빌드한 인덱스 파일을 mmap 으로 공유합니다.
+# (python phishing_index.py build 로 생성, 없으면 시작 시 자동 빌드)
+# 인덱스 파일이 교체되면 PHISHING_DB_WATCH_INTERVAL 초 이내에 새 버전으로 전환합니다.
+phishing_db = PhishingDB(check_interval=float(os.environ.get('PHISHING_DB_WATCH_INTERVAL', 5)))
 try:
-    db_path = os.path.join(os.path.dirname(__file__), 'data', 'phishing_db.txt')
-    if os.path.exists(db_path):
-        with open(db_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    phishing_db.add(line.lower())
-        print(f"Loaded {len(phishing_db)} phishing domains.")
-    else:
+    if phishing_db.load() is None:
         print("Warning: Phishing database file not found.")
 except Exception as e:
     print(f"Warning: Could not load phishing database: {e}")
 
-def check_password_strength(password):
-    result = zxcvbn(password)
+# URL 휴리스틱 규칙 (data/heuristic_rules.txt, 하나의 정규식으로 컴파일)
+heuristics = HeuristicEngine.from_file()
+
+# 리다이렉트 추적기 (워커 내 커넥션 풀 공유, 경로 전체 5초 예산)
+# 추적은 전용 이벤트 루프에서 실행되며, 결과를 기다리는 요청 스레드 수를
+# URL_EXPANDER_WAITERS 로 제한해 gunicorn 스레드(gunicorn.conf.py)를 다른 라우트용으로 남겨 둡니다.
+url_tracer = RedirectTracer(
+    budget=5.0,
+    concurrency=int(os.environ.get('URL_EXPANDER_CONCURRENCY', 50)),
+    per_host=int(os.environ.get('URL_EXPANDER_PER_HOST', 4)),
+    max_waiters=int(os.environ.get('URL_EXPANDER_WAITERS', 6))
+)
+
+# URL 검사 결과 캐시 (REDIS_URL 설정 시 워커 간 공유)
+url_cache = ResultCache(
+    maxsize=int(os.environ.get('URL_CACHE_SIZE', 10000)),
+    success_ttl=int(os.environ.get('URL_CACHE_TTL', 600)),
+    failure_ttl=int(os.environ.get('URL_CACHE_FAILURE_TTL', 60)),
+    redis_url=os.environ.get('REDIS_URL')
+)
+
+# 일괄 검사: 요청당 최대 URL 수와 동시 확장 수 상한
+URL_BATCH_MAX = int(os.environ.get('URL_BATCH_MAX', 1000))
+URL_BATCH_PARALLELISM = int(os.environ.get('URL_BATCH_PARALLELISM', 10))
+
+# 관리자 API 토큰 (설정하지 않으면 관리자 API 비활성화)
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# 경고 메시지 번역 맵
+WARNING_MAP = {
+    "Straight rows of keys are easy to guess": "키보드에서 연속된 키 배열(예: qwerty)은 추측하기 쉽습니다.",
+    "Short keyboard patterns are easy to guess": "짧은 키보드 패턴은 추측하기 쉽습니다.",
+    "Repeats like \"aaa\" are easy to guess": "'aaa'와 같은 반복 문자는 추측하기 쉽습니다.",
+    "Repeats like \"abcabcabc\" are only slightly harder to guess than \"abc\"": "반복되는 패턴은 보안에 취약합니다.",
+    "Sequences like abc or 6543 are easy to guess": "abc나 6543 같은 연속된 문자/숫자는 피해야 합니다.",
+    "Recent years are easy to guess": "최근 연도(2020, 2021 등)는 추측하기 쉽습니다.",
+    "Dates are often easy to guess": "생일이나 기념일 같은 날짜는 피하는 것이 좋습니다.",
+    "Top 10 common passwords": "세계에서 가장 많이 쓰이는 10대 비밀번호 중 하나입니다.",
+    "Top 100 common passwords": "매우 자주 사용되는 비밀번호입니다. 즉시 변경하세요.",
+    "Very common passwords": "매우 흔한 비밀번호입니다.",
+    "Similar to a common password": "흔한 비밀번호입니다.",
+    "A word by itself is easy to guess": "단어 하나만 사용하는 것은 위험합니다.",
+    "Names and surnames by themselves are easy to guess": "이름이나 성만 사용하는 것은 위험합니다.",
+    "Common names and surnames are easy to guess": "흔한 이름은 쉽게 추측할 수 있습니다.",
+
+    # 전체 문장 변형 (마침표 유무 포함)
+    "This is a top-10 common password": "세계에서 가장 많이 쓰이는 10대 비밀번호 중 하나입니다.",
+    "This is a top-100 common password": "매우 자주 사용되는 비밀번호입니다. 즉시 변경하세요.",
+    "This is a very common password": "매우 흔한 비밀번호입니다.",
+    "This is similar to a commonly used password": "흔한 비밀번호입니다."
+}
+
+# 제안 메시지 번역 맵
+SUGGESTION_MAP = {
+    "Add another word or two. Uncommon words are better.": "단어를 한두 개 더 추가하세요. 흔하지 않은 단어가 좋습니다.",
+    "Use a longer keyboard pattern with more turns.": "더 길고 복잡한 키보드 패턴을 사용하세요.",
+    "Avoid repeated words and characters.": "반복되는 단어나 문자를 피하세요.",
+    "Avoid sequences.": "연속된 문자나 숫자를 피하세요.",
+    "Avoid recent years.": "최근 연도를 포함하지 마세요.",
+    "Avoid years that are associated with you.": "본인과 관련된 연도를 피하세요.",
+    "Avoid dates and years that are associated with you.": "본인과 관련된 날짜나 연도를 피하세요.",
+    "Capitalization doesn't help very much.": "대문자만으로는 충분하지 않습니다.",
+    "All-uppercase is almost as easy to guess as all-lowercase.": "모두 대문자로 쓰는 것은 소문자만큼이나 추측하기 쉽습니다.",
+    "Reversed words are not much harder to guess.": "단어를 거꾸로 쓰는 것도 추측하기 어렵지 않습니다.",
+    "Predictable substitutions like '@' instead of 'a' don't help very much.": "'a' 대신 '@'를 쓰는 것 같은 뻔한 치환은 도움이 되지 않습니다."
+}
+
+# 해킹 소요 시간 번역
+TIME_TRANSLATIONS = {
+    "less than a second": "1초 미만",
+    "seconds": "초",
+    "minutes": "분",
+    "hours": "시간",
+    "days": "일",
+    "months": "개월",
+    "years": "년",
+    "centuries": "1세기 이상"
+}
+
+def compute_password_strength(password):
+    with metrics.stage('zxcvbn'):
+        result = zxcvbn(password)
     score = result['score'] # 0-4
     
     # 점수를 등급으로 매핑
@@ -44,65 +138,26 @@ def check_password_strength(password):
         "suggestions": []
     }
     
-    # 경고 메시지 번역 맵
-    warning_map = {
-        "Straight rows of keys are easy to guess": "키보드에서 연속된 키 배열(예: qwerty)은 추측하기 쉽습니다.",
-        "Short keyboard patterns are easy to guess": "짧은 키보드 패턴은 추측하기 쉽습니다.",
-        "Repeats like \"aaa\" are easy to guess": "'aaa'와 같은 반복 문자는 추측하기 쉽습니다.",
-        "Repeats like \"abcabcabc\" are only slightly harder to guess than \"abc\"": "반복되는 패턴은 보안에 취약합니다.",
-        "Sequences like abc or 6543 are easy to guess": "abc나 6543 같은 연속된 문자/숫자는 피해야 합니다.",
-        "Recent years are easy to guess": "최근 연도(2020, 2021 등)는 추측하기 쉽습니다.",
-        "Dates are often easy to guess": "생일이나 기념일 같은 날짜는 피하는 것이 좋습니다.",
-        "Top 10 common passwords": "세계에서 가장 많이 쓰이는 10대 비밀번호 중 하나입니다.",
-        "Top 100 common passwords": "매우 자주 사용되는 비밀번호입니다. 즉시 변경하세요.",
-        "Very common passwords": "매우 흔한 비밀번호입니다.",
-        "Similar to a common password": "흔한 비밀번호입니다.",
-        "A word by itself is easy to guess": "단어 하나만 사용하는 것은 위험합니다.",
-        "Names and surnames by themselves are easy to guess": "이름이나 성만 사용하는 것은 위험합니다.",
-        "Common names and surnames are easy to guess": "흔한 이름은 쉽게 추측할 수 있습니다.",
-        
-        # 전체 문장 변형 (마침표 유무 포함)
-        "This is a top-10 common password": "세계에서 가장 많이 쓰이는 10대 비밀번호 중 하나입니다.",
-        "This is a top-100 common password": "매우 자주 사용되는 비밀번호입니다. 즉시 변경하세요.",
-        "This is a very common password": "매우 흔한 비밀번호입니다.",
-        "This is similar to a commonly used password": "흔한 비밀번호입니다."
-    }
-    
     original_warning = result['feedback']['warning']
     
     # 견고한 번역 조회
     translated_warning = None
     if original_warning:
         # 1. 정확한 일치 시도
-        translated_warning = warning_map.get(original_warning)
+        translated_warning = WARNING_MAP.get(original_warning)
         
         # 2. 찾을 수 없는 경우, 끝의 마침표 제거 시도
         if not translated_warning and original_warning.endswith('.'):
-            translated_warning = warning_map.get(original_warning[:-1])
+            translated_warning = WARNING_MAP.get(original_warning[:-1])
             
         # 3. 찾을 수 없는 경우, 끝에 마침표 추가 시도
         if not translated_warning and not original_warning.endswith('.'):
-            translated_warning = warning_map.get(original_warning + '.')
+            translated_warning = WARNING_MAP.get(original_warning + '.')
             
         feedback_trans['warning'] = translated_warning if translated_warning else original_warning
     
-    # 제안 메시지 번역 맵
-    suggestion_map = {
-        "Add another word or two. Uncommon words are better.": "단어를 한두 개 더 추가하세요. 흔하지 않은 단어가 좋습니다.",
-        "Use a longer keyboard pattern with more turns.": "더 길고 복잡한 키보드 패턴을 사용하세요.",
-        "Avoid repeated words and characters.": "반복되는 단어나 문자를 피하세요.",
-        "Avoid sequences.": "연속된 문자나 숫자를 피하세요.",
-        "Avoid recent years.": "최근 연도를 포함하지 마세요.",
-        "Avoid years that are associated with you.": "본인과 관련된 연도를 피하세요.",
-        "Avoid dates and years that are associated with you.": "본인과 관련된 날짜나 연도를 피하세요.",
-        "Capitalization doesn't help very much.": "대문자만으로는 충분하지 않습니다.",
-        "All-uppercase is almost as easy to guess as all-lowercase.": "모두 대문자로 쓰는 것은 소문자만큼이나 추측하기 쉽습니다.",
-        "Reversed words are not much harder to guess.": "단어를 거꾸로 쓰는 것도 추측하기 어렵지 않습니다.",
-        "Predictable substitutions like '@' instead of 'a' don't help very much.": "'a' 대신 '@'를 쓰는 것 같은 뻔한 치환은 도움이 되지 않습니다."
-    }
-    
     for suggestion in result['feedback']['suggestions']:
-        feedback_trans['suggestions'].append(suggestion_map.get(suggestion, suggestion))
+        feedback_trans['suggestions'].append(SUGGESTION_MAP.get(suggestion, suggestion))
 
     # 점수가 낮은 경우 일반적인 OWASP 가이드라인 추가
     if score < 3:
@@ -112,71 +167,114 @@ def check_password_strength(password):
     # 해킹 소요 시간 표시
     crack_time = result['crack_times_display']['offline_slow_hashing_1e4_per_second']
     
-    # 해킹 소요 시간 번역
-    time_translations = {
-        "less than a second": "1초 미만",
-        "seconds": "초",
-        "minutes": "분",
-        "hours": "시간",
-        "days": "일",
-        "months": "개월",
-        "years": "년",
-        "centuries": "1세기 이상"
-    }
-    
-    for en, ko in time_translations.items():
+    for en, ko in TIME_TRANSLATIONS.items():
         crack_time = crack_time.replace(en, ko)
     
     return rating, css_class, feedback_trans, crack_time
 
+# 비밀번호 검사 결과 캐시
+# 평문 비밀번호는 저장하지 않고, 프로세스마다 새로 만드는 비밀키의 HMAC 을 키로 사용합니다.
+# PASSWORD_CACHE_SIZE=0 이면 캐시를 사용하지 않습니다.
+password_cache = LRUCache(maxsize=int(os.environ.get('PASSWORD_CACHE_SIZE', 10000)))
+_password_cache_secret = (None, None)
+
+def password_cache_key(password):
+    global _password_cache_secret
+    pid, secret = _password_cache_secret
+    if pid != os.getpid():
+        # preload 후 fork 된 워커는 마스터와 다른 비밀키를 사용합니다.
+        secret = os.urandom(32)
+        _password_cache_secret = (os.getpid(), secret)
+        password_cache.clear()
+    return hmac.new(secret, password.encode('utf-8'), hashlib.sha256).digest()
+
+def check_password_strength(password):
+    if password_cache.maxsize <= 0:
+        return compute_password_strength(password)
+    key = password_cache_key(password)
+    cached = password_cache.get(key)
+    if cached is None:
+        cached = compute_password_strength(password)
+        password_cache.set(key, cached)
+    rating, css_class, feedback, crack_time = cached
+    # 호출한 쪽에서 수정해도 캐시가 바뀌지 않도록 피드백은 복사해서 반환
+    return rating, css_class, dict(feedback, suggestions=list(feedback['suggestions'])), crack_time
+
+def trace_url(input_url):
+    """리다이렉트 경로를 추적하고 전체 시간과 hop 별 DNS/연결/응답 시간을 기록합니다."""
+    with metrics.stage('expand'):
+        trace = url_tracer.trace(input_url)
+    record_trace(trace)
+    return trace
+
+def record_trace(trace):
+    for i, hop in enumerate(trace.hops, 1):
+        if hop.dns_ms is not None:
+            metrics.record('dns', hop.dns_ms / 1000)
+        if hop.connect_ms is not None:
+            metrics.record('connect', hop.connect_ms / 1000)
+        metrics.record('hop', hop.latency_ms / 1000, entry=f'hop{i}', desc=str(hop.status_code))
+
 def expand_url(short_url):
-    try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-        response = requests.get(short_url, headers=headers, timeout=5, allow_redirects=True)
-        return response.url, response.status_code, None
-    except requests.exceptions.Timeout:
-        return None, None, "사이트 응답 시간이 초과되었습니다. (Timeout)"
-    except requests.exceptions.ConnectionError:
-        return None, None, "사이트에 접속할 수 없습니다. 도메인이 존재하지 않거나 서버가 다운되었습니다."
-    except requests.exceptions.TooManyRedirects:
-        return None, None, "리다이렉트 횟수가 너무 많습니다. (순환 참조 가능성)"
-    except Exception as e:
-        return None, None, f"오류가 발생했습니다: {str(e)}"
+    trace = trace_url(short_url)
+    if trace.error:
+        return None, None, trace.error
+    return trace.final_url, trace.status_code, None
+
+# 안전 상태의 심각도 (높을수록 위험)
+SAFETY_LEVELS = [("위험", 3), ("의심됨", 2), ("알 수 없음", 1)]
+
+def safety_level(safety_status):
+    for prefix, level in SAFETY_LEVELS:
+        if safety_status.startswith(prefix):
+            return level
+    return 0
 
 def check_malicious(url):
     # 실제 악성 여부 확인을 위한 자리 표시자
     # 실제 시나리오에서는 Google Safe Browsing API 또는 VirusTotal API를 호출합니다.
-    suspicious_keywords = ['login', 'signin', 'bank', 'account', 'update', 'verify', 'secure', 'bonus', 'free', 'crypto', 'wallet', 'phishing', 'phish']
-    
     try:
         parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        # 포트가 있는 경우 제거
-        if ':' in domain:
-            domain = domain.split(':')[0]
-            
-        full_url_lower = url.lower()
+        # hostname 은 포트와 사용자 정보(user@)를 제외하고 소문자로 반환
+        domain = parsed.hostname or ''
         
-        # 1. 피싱 데이터베이스와 대조 확인
-        if domain in phishing_db:
-            return "위험 (피싱 데이터베이스에 등록됨)"
+        # 1. 피싱 데이터베이스와 대조 확인 (상위 도메인 규칙 포함)
+        with metrics.stage('phishing_db'):
+            match = phishing_db.match(domain)
+        if match and not match.allowed:
+            return f"위험 (피싱 데이터베이스에 등록됨: {match.rule})"
         
-        # IP 주소 사용 여부 확인
-        try:
-            socket.inet_aton(domain)
-            return "의심됨 (IP 주소 직접 사용)"
-        except socket.error:
-            pass
-            
-        # 전체 URL에서 의심스러운 키워드 확인 (도메인뿐만 아니라)
-        for keyword in suspicious_keywords:
-            if keyword in full_url_lower:
-                return f"의심됨 ('{keyword}' 키워드 발견)"
+        # 2. 휴리스틱 규칙 (IP 주소, 동형 문자, 키워드 등)을 한 번에 검사
+        with metrics.stage('heuristics'):
+            result = heuristics.scan(url)
+        if result.score >= heuristics.threshold:
+            return f"의심됨 ({heuristics.describe(result)})"
                 
         return "안전함"
     except:
         return "알 수 없음"
 
+@app.before_request
+def start_timing():
+    g.request_started = time.perf_counter()
+    metrics.start_request()
+
+@app.after_request
+def add_server_timing(response):
+    elapsed = time.perf_counter() - g.request_started
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    metrics.observe('request_duration_seconds', elapsed, route=route, method=request.method)
+    timings = metrics.end_request()
+    total = f"total;dur={elapsed * 1000:.2f}"
+    response.headers['Server-Timing'] = f"{timings}, {total}" if timings else total
+    metrics.flush()
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    # Prometheus 수집용 (모든 워커의 히스토그램 합계)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -219,6 +317,67 @@ def api_password_check():
         'password': password
     })
 
+def normalize_input_url(input_url):
+    input_url = input_url.strip()
+    if not input_url.startswith(('http://', 'https://')):
+        input_url = 'http://' + input_url
+    return input_url
+
+def build_result(input_url, trace):
+    """추적 결과(Trace)로 리다이렉트 경로 전체의 안전성을 검사한 결과를 만듭니다."""
+    # 입력된 URL의 안전성 먼저 확인
+    safety_status = check_malicious(input_url)
+    
+    # 리다이렉트 경로의 모든 hop 을 검사하고, 가장 위험한 결과를 표시.
+    # (오류로 중단된 경우 마지막으로 시도한 URL 도 검사)
+    chain = []
+    for hop in trace.hops:
+        hop_safety = check_malicious(hop.url)
+        chain.append({
+            'url': hop.url,
+            'status_code': hop.status_code,
+            'latency_ms': hop.latency_ms,
+            'safety_status': hop_safety
+        })
+        if safety_level(hop_safety) > safety_level(safety_status):
+            safety_status = hop_safety
+    if trace.error and trace.final_url != input_url:
+        final_safety = check_malicious(trace.final_url)
+        if safety_level(final_safety) > safety_level(safety_status):
+            safety_status = final_safety
+
+    return {
+        'final_url': trace.final_url,
+        'status_code': trace.status_code,
+        'error': trace.error,
+        'safety_status': safety_status,
+        'input_url': input_url,
+        'chain': chain
+    }
+
+def analyze_url(input_url):
+    """URL 을 확장하고 리다이렉트 경로 전체의 안전성을 검사한 결과를 반환합니다."""
+    return build_result(input_url, trace_url(input_url))
+
+def verdict_version():
+    """검사 결과 캐시 키에 쓰는 버전. 피싱 DB 나 휴리스틱 규칙이 바뀌면 달라집니다."""
+    # 캐시 적중만 계속되면 조회(match)가 없어 DB 교체를 감지하지 못하므로 여기서 확인합니다.
+    phishing_db.refresh()
+    return f"{phishing_db.version}.{heuristics.version}"
+
+def analyze_url_cached(input_url):
+    """캐시를 거쳐 analyze_url 결과를 반환합니다. 응답에 캐시 사용 여부를 표시합니다."""
+    version = verdict_version()
+    result = url_cache.get(input_url, version)
+    if result is not None:
+        return dict(result, input_url=input_url, cached=True)
+
+    result = analyze_url(input_url)
+    # 혼잡으로 검사하지 못한 결과는 캐시하지 않습니다.
+    if result['error'] != ERROR_BUSY:
+        url_cache.set(input_url, version, result)
+    return dict(result, cached=False)
+
 @app.route('/api/url-expander', methods=['POST'])
 def api_url_expander():
     data = request.get_json()
@@ -227,32 +386,145 @@ def api_url_expander():
     if not input_url:
         return jsonify({'error': 'URL을 입력해주세요.'}), 400
         
-    if not input_url.startswith(('http://', 'https://')):
-        input_url = 'http://' + input_url
-    
-    # 입력된 URL의 안전성 먼저 확인
-    safety_status = check_malicious(input_url)
-    
-    final_url, status_code, error = expand_url(input_url)
-    
-    # 확장이 성공하면 최종 URL도 확인 (다를 수 있음)
-    if not error and final_url and final_url != input_url:
-        final_safety = check_malicious(final_url)
-        # 최종 URL이 입력 URL보다 위험하면 최종 URL 결과 사용.
-        # 간단한 로직: 둘 중 하나라도 안전하지 않으면 안전하지 않은 것을 표시.
-        if final_safety != "안전함":
-            safety_status = final_safety
+    input_url = normalize_input_url(input_url)
 
     # 연결 오류가 있어도 200 OK 반환,
     # 프론트엔드에서 안전 상태와 오류 메시지를 함께 표시할 수 있도록 함.
+    return jsonify(analyze_url_cached(input_url))
+
+def iter_batch_results(urls, parallelism):
+    """URL 들을 최대 parallelism 개씩 동시에 확장하며, 끝나는 순서대로 결과를 반환합니다.
+
+    캐시에 있는 결과는 네트워크 없이 바로 반환합니다. 진행 중인 확장만
+    메모리에 두므로 배치 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+    version = verdict_version()
+    pending = deque(urls)
+    done = queue.Queue()
+    in_flight = set()
+    try:
+        while pending or in_flight:
+            while pending and len(in_flight) < parallelism:
+                input_url = pending.popleft()
+                result = url_cache.get(input_url, version)
+                if result is not None:
+                    yield dict(result, input_url=input_url, cached=True)
+                    continue
+                future = url_tracer.submit(input_url)
+                future.add_done_callback(lambda f, input_url=input_url: done.put((input_url, f)))
+                in_flight.add(future)
+
+            if in_flight:
+                input_url, future = done.get()
+                in_flight.discard(future)
+                trace = future.result()
+                # 스트리밍 중에는 헤더가 이미 전송되었으므로 히스토그램에만 기록됩니다.
+                record_trace(trace)
+                result = build_result(input_url, trace)
+                url_cache.set(input_url, version, result)
+                yield dict(result, cached=False)
+    finally:
+        # 클라이언트가 연결을 끊으면 남은 확장을 취소합니다.
+        for future in in_flight:
+            future.cancel()
+
+@app.route('/api/url-expander/batch', methods=['POST'])
+def api_url_expander_batch():
+    # 요청 형식:
+    #   JSON {"urls": [...], "parallelism": 5} 또는 JSON 배열 [...]
+    #   또는 줄 단위 URL 목록 (text/plain 본문 또는 multipart 'file' 업로드)
+    # 응답: 결과가 끝나는 순서대로 한 줄에 하나씩 NDJSON 으로 스트리밍
+    parallelism = request.args.get('parallelism', type=int)
+    if request.is_json:
+        data = request.get_json(silent=True)
+        if isinstance(data, list):
+            urls = data
+        elif isinstance(data, dict):
+            urls = data.get('urls')
+            parallelism = data.get('parallelism', parallelism)
+        else:
+            return jsonify({'error': '요청 본문은 JSON 객체 또는 URL 배열이어야 합니다.'}), 400
+        if not isinstance(urls, list) or not all(isinstance(u, str) for u in urls):
+            return jsonify({'error': 'urls 는 URL 문자열 목록이어야 합니다.'}), 400
+    else:
+        upload = request.files.get('file')
+        text = upload.read().decode('utf-8', 'replace') if upload else request.get_data(as_text=True)
+        urls = [line for line in text.splitlines() if not line.strip().startswith('#')]
+
+    # 빈 줄 제거, 정규화된 URL 기준 중복 제거 (입력 순서 유지)
+    unique = {}
+    for input_url in urls:
+        if input_url.strip():
+            input_url = normalize_input_url(input_url)
+            unique.setdefault(normalize_url(input_url), input_url)
+    urls = list(unique.values())
+
+    if not urls:
+        return jsonify({'error': 'URL을 입력해주세요.'}), 400
+    if len(urls) > URL_BATCH_MAX:
+        return jsonify({'error': f'한 번에 최대 {URL_BATCH_MAX}개의 URL까지 검사할 수 있습니다.'}), 400
+
+    try:
+        parallelism = max(1, min(int(parallelism or URL_BATCH_PARALLELISM), URL_BATCH_PARALLELISM))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'parallelism 은 숫자여야 합니다.'}), 400
+
+    # 배치도 결과를 기다리는 동안 요청 스레드 하나를 점유하므로 같은 한도를 적용합니다.
+    if not url_tracer.acquire_waiter():
+        return jsonify({'error': ERROR_BUSY}), 503
+
+    def generate():
+        for result in iter_batch_results(urls, parallelism):
+            yield json.dumps(result, ensure_ascii=False) + '\n'
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.call_on_close(url_tracer.release_waiter)
+    return response
+
+def is_admin_request():
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+@app.route('/api/admin/phishing-db', methods=['GET'])
+def api_phishing_db_status():
+    if not is_admin_request():
+        return jsonify({'error': '권한이 없습니다.'}), 403
+
     return jsonify({
-        'final_url': final_url if final_url else input_url,
-        'status_code': status_code,
-        'error': error,
-        'safety_status': safety_status,
-        'input_url': input_url
+        'version': phishing_db.version,
+        'count': len(phishing_db),
+        'history': list(phishing_db.history)
     })
 
+@app.route('/api/admin/phishing-db/reload', methods=['POST'])
+def api_phishing_db_reload():
+    if not is_admin_request():
+        return jsonify({'error': '권한이 없습니다.'}), 403
+
+    # 요청 본문 형식:
+    #   {"delta": ["+evil.com", "-old.com"]} - 현재 인덱스에 델타 적용
+    #   {"rebuild": true}                     - 텍스트 DB 전체로 다시 빌드
+    #   {} 또는 본문 없음                      - 디스크의 인덱스 파일 다시 열기
+    data = request.get_json(silent=True) or {}
+    try:
+        if data.get('delta'):
+            record = phishing_db.apply_delta(data['delta'])
+        elif data.get('rebuild'):
+            record = phishing_db.rebuild()
+        else:
+            record = phishing_db.reload()
+    except (OSError, ValueError) as e:
+        return jsonify({'error': '피싱 데이터베이스를 다시 불러오지 못했습니다: ' + str(e)}), 400
+
+    return jsonify(record)
+
+@app.route('/api/admin/url-cache', methods=['GET'])
+def api_url_cache_status():
+    if not is_admin_request():
+        return jsonify({'error': '권한이 없습니다.'}), 403
+
+    return jsonify(url_cache.stats())
+
 @app.route('/url-expander', methods=['GET', 'POST'])
 def url_expander():
     final_url = None
@@ -263,8 +535,7 @@ def url_expander():
     if request.method == 'POST':
         input_url = request.form.get('url')
         if input_url:
-            if not input_url.startswith(('http://', 'https://')):
-                input_url = 'http://' + input_url
+            input_url = normalize_input_url(input_url)
             final_url, status_code, error = expand_url(input_url)
             
     return render_template('url_expander.html', final_url=final_url, status_code=status_code, error=error, input_url=input_url)
@@ -0,0 +1,41 @@
+# gunicorn 설정 (Procfile 의 `gunicorn app:app` 이 자동으로 읽습니다)
+import gc
+import os
+import tempfile
+
+import metrics
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+# 스레드 워커: URL 확장은 워커의 이벤트 루프에서 처리되고, 결과를 기다리는
+# 요청 스레드는 URL_EXPANDER_WAITERS 개로 제한됩니다. 나머지 스레드는
+# 느린 URL 이 몰려도 /api/password-check 등 다른 라우트를 처리합니다.
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+# 마스터에서 앱을 한 번만 임포트(zxcvbn 사전 생성, 피싱 인덱스 mmap 등)한 뒤
+# 워커를 fork 하므로, 워커는 부팅 비용 없이 copy-on-write 로 메모리를 공유합니다.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+if preload_app:
+    # 마스터에서는 GC 를 끄고 fork 직전에 모든 객체를 영구 세대로 옮겨,
+    # 워커의 GC 가 공유 페이지를 건드려 복사가 일어나지 않도록 합니다.
+    gc.disable()
+
+    def pre_fork(server, worker):
+        gc.freeze()
+
+    def post_fork(server, worker):
+        gc.enable()
+
+# 워커별 지연 시간 히스토그램 파일을 모아 /metrics 에서 합산하는 디렉터리.
+# 앱을 임포트하기 전에 설정해야 워커가 같은 디렉터리를 사용합니다.
+metrics_dir = os.environ.setdefault(
+    'METRICS_DIR', os.path.join(tempfile.gettempdir(), f"0room-metrics-{os.environ.get('PORT', '8000')}"))
+
+
+def on_starting(server):
+    # 이전 실행의 워커 파일이 합산되지 않도록 비웁니다.
+    os.makedirs(metrics_dir, exist_ok=True)
+    metrics.clear_directory(metrics_dir)
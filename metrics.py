@@ -0,0 +1,191 @@
+"""단계별 지연 시간 측정
+
+요청 처리 중 주요 단계(피싱 DB 조회, 휴리스틱 검사, zxcvbn 점수 계산, URL 확장의
+DNS/연결/각 hop 등)에 걸린 시간을 기록합니다.
+
+- 단계별 시간은 히스토그램에 누적되고, 요청 처리 중이면 해당 요청의 측정 목록에도
+  추가되어 응답의 Server-Timing 헤더로 내려갑니다.
+- gunicorn 워커마다 히스토그램을 METRICS_DIR/<pid>.json 에 주기적으로 기록하고,
+  /metrics 는 디렉터리의 모든 파일을 합쳐 Prometheus 텍스트 형식으로 반환합니다.
+  종료된 워커의 파일도 남겨 두므로 워커가 재시작되어도 누적 값이 줄지 않습니다.
+  METRICS_DIR 이 없으면 현재 프로세스의 값만 보여줍니다.
+"""
+import bisect
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# 히스토그램 버킷 경계(초)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PREFIX = 'zeroroom_'
+
+HELP = {
+    'stage_duration_seconds': "처리 단계별 소요 시간",
+    'request_duration_seconds': "라우트별 요청 처리 시간",
+}
+
+
+def _format_le(bound):
+    return '+Inf' if bound is None else repr(float(bound))
+
+
+def _format_labels(labels):
+    return ','.join(f'{key}="{value}"' for key, value in labels)
+
+
+class Metrics:
+    """워커 내 히스토그램 저장소와 요청별 Server-Timing 측정 목록."""
+
+    def __init__(self, directory=None, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._reset()
+        # preload 된 마스터에서 fork 된 워커는 마스터의 값을 이어받지 않습니다.
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        # (이름, 레이블) -> [버킷별 개수, 합계, 개수]
+        self._histograms = {}
+        self._flushed_at = time.monotonic()
+        self._dirty = False
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+            self._dirty = True
+
+    def record(self, stage, seconds, entry=None, desc=None):
+        """단계 시간을 히스토그램에 기록하고, 요청 처리 중이면 Server-Timing 에도 추가합니다.
+
+        entry 는 Server-Timing 항목 이름입니다 (기본값은 stage).
+        """
+        self.observe('stage_duration_seconds', seconds, stage=stage)
+        timings = getattr(self._local, 'timings', None)
+        if timings is not None:
+            timings.append((entry or stage, seconds, desc))
+
+    @contextmanager
+    def stage(self, stage):
+        """with 블록의 실행 시간을 stage 로 기록합니다."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    def start_request(self):
+        self._local.timings = []
+
+    def end_request(self):
+        """현재 요청의 측정을 끝내고 Server-Timing 헤더 값을 반환합니다.
+
+        같은 이름의 항목은 합쳐서 하나로 표시합니다 (예: hop 마다 호출되는 피싱 DB 조회).
+        """
+        timings = getattr(self._local, 'timings', None)
+        self._local.timings = None
+        if not timings:
+            return None
+        merged = {}
+        for entry, seconds, desc in timings:
+            if entry in merged:
+                merged[entry][0] += seconds
+            else:
+                merged[entry] = [seconds, desc]
+        parts = []
+        for entry, (seconds, desc) in merged.items():
+            part = f"{entry};dur={seconds * 1000:.2f}"
+            if desc:
+                part += f';desc="{desc}"'
+            parts.append(part)
+        return ', '.join(parts)
+
+    def _snapshot(self):
+        with self._lock:
+            self._dirty = False
+            return [[name, list(labels), list(histogram[0]), histogram[1], histogram[2]]
+                    for (name, labels), histogram in self._histograms.items()]
+
+    def flush(self, force=False):
+        """이 워커의 히스토그램을 METRICS_DIR/<pid>.json 에 기록합니다.
+
+        force 가 아니면 flush_interval 초에 한 번만 기록합니다.
+        """
+        if not self.directory or not (self._dirty or force):
+            return
+        now = time.monotonic()
+        if not force and now - self._flushed_at < self.flush_interval:
+            return
+        self._flushed_at = now
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self._snapshot(), f)
+            os.replace(tmp_path, os.path.join(self.directory, f"{os.getpid()}.json"))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def collect(self):
+        """모든 워커의 히스토그램을 합쳐 {(이름, 레이블): [버킷, 합계, 개수]} 로 반환합니다."""
+        if not self.directory:
+            return {(name, tuple(map(tuple, labels))): [buckets, total, count]
+                    for name, labels, buckets, total, count in self._snapshot()}
+        self.flush(force=True)
+        merged = {}
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, labels, buckets, total, count in snapshot:
+                key = (name, tuple(map(tuple, labels)))
+                histogram = merged.get(key)
+                if histogram is None:
+                    merged[key] = [buckets, total, count]
+                else:
+                    histogram[0] = [a + b for a, b in zip(histogram[0], buckets)]
+                    histogram[1] += total
+                    histogram[2] += count
+        return merged
+
+    def render(self):
+        """Prometheus 텍스트 형식으로 모든 히스토그램을 반환합니다."""
+        lines = []
+        current = None
+        for (name, labels), (buckets, total, count) in sorted(self.collect().items()):
+            metric = PREFIX + name
+            if name != current:
+                current = name
+                lines.append(f"# HELP {metric} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, bucket in zip(BUCKETS + (None,), buckets):
+                cumulative += bucket
+                label_text = _format_labels(labels + (('le', _format_le(bound)),))
+                lines.append(f"{metric}_bucket{{{label_text}}} {cumulative}")
+            label_text = _format_labels(labels)
+            lines.append(f"{metric}_sum{{{label_text}}} {total!r}")
+            lines.append(f"{metric}_count{{{label_text}}} {count}")
+        return '\n'.join(lines) + '\n'
+
+
+def clear_directory(directory):
+    """서버 시작 시 이전 실행의 워커 파일을 지웁니다."""
+    for path in glob.glob(os.path.join(directory, '*.json')) + glob.glob(os.path.join(directory, '*.tmp')):
+        os.unlink(path)
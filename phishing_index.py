@@ -0,0 +1,516 @@
+"""피싱 도메인 인덱스 (mmap 공유 인덱스)
+
+phishing_db.txt 를 정렬된 바이너리 파일(.idx)로 한 번만 변환해 두고,
+각 gunicorn 워커는 이 파일을 읽기 전용으로 mmap 하여 조회합니다.
+모든 프로세스가 페이지 캐시의 같은 사본을 공유하므로 워커마다
+50만 개의 str 객체를 만들 필요가 없고, 워커 부팅 시 파싱 비용도 없습니다.
+
+도메인은 라벨을 뒤집은 키(evil.example.com -> com.example.evil)로 정렬되어
+있어, 정렬 배열 자체가 라벨 단위 트라이 역할을 합니다. 호스트를 TLD 부터 한
+라벨씩 내려가며 탐색 범위를 좁히므로, 호스트와 모든 상위 도메인을 한 번의
+탐색으로 확인합니다.
+
+규칙 문법 (phishing_db.txt 한 줄에 하나):
+    example.com      example.com 과 모든 하위 도메인 차단
+    *.example.com    하위 도메인만 차단 (example.com 자체는 제외)
+    @@example.com    허용 목록 - 더 깊은(구체적인) 규칙이 우선합니다
+    @@*.example.com  하위 도메인만 허용
+
+파일 형식 (네이티브 바이트 순서):
+    헤더     magic(8) | format(uint32) | count(uint32) | db_version(uint32)
+    오프셋   uint32 * (count + 1)   - 각 키의 blob 내 시작 위치
+    플래그   uint8 * count          - 키별 규칙 플래그
+    blob     정렬된 키 바이트열을 구분자 없이 이어 붙인 것
+
+db_version 은 빌드/델타 적용 때마다 1씩 증가합니다. 실행 중인 워커는
+PhishingDB 가 인덱스 파일 교체를 감지해 새 버전으로 원자적으로 전환하므로,
+빌드나 델타 적용을 한 프로세스에서만 실행해도 모든 워커에 반영됩니다.
+빌드와 델타 적용은 인덱스 옆의 잠금 파일(.lock)로 프로세스 간에 직렬화되므로,
+여러 워커가 동시에 델타를 적용해도 서로의 변경을 덮어쓰지 않습니다.
+
+델타 파일 형식 (한 줄에 하나, '#' 주석 허용):
+    +evil.example.com    규칙 추가
+    -old.example.com     규칙 제거
+
+사용법:
+    python phishing_index.py build [phishing_db.txt] [phishing_db.idx]
+    python phishing_index.py delta <delta 파일> [phishing_db.idx]
+"""
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+MAGIC = b'0ROOMIDX'
+FORMAT_VERSION = 3
+HEADER = struct.Struct('=8sIII')
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_SOURCE = os.path.join(DATA_DIR, 'phishing_db.txt')
+DEFAULT_INDEX = os.path.join(DATA_DIR, 'phishing_db.idx')
+
+# 규칙 플래그
+BLOCK_SELF = 0x1
+BLOCK_SUB = 0x2
+ALLOW_SELF = 0x4
+ALLOW_SUB = 0x8
+
+# 조회 결과: rule 은 원래 규칙 문법으로 복원한 문자열, allowed 는 허용 목록 여부
+Match = namedtuple('Match', ['rule', 'allowed'])
+
+
+def read_rules(path):
+    """텍스트 DB 에서 주석/빈 줄을 제외한 규칙을 소문자로 읽습니다."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line.lower()
+
+
+def parse_rule(rule):
+    """규칙 한 줄을 (뒤집힌 라벨 키, 플래그) 로 변환합니다."""
+    rule = rule.strip().lower()
+    allow = rule.startswith('@@')
+    if allow:
+        rule = rule[2:]
+    if rule.startswith('*.'):
+        rule = rule[2:]
+        flags = ALLOW_SUB if allow else BLOCK_SUB
+    else:
+        flags = (ALLOW_SELF | ALLOW_SUB) if allow else (BLOCK_SELF | BLOCK_SUB)
+    labels = rule.strip('.').split('.')
+    return '.'.join(reversed(labels)).encode('utf-8'), flags
+
+
+def format_rule(key, flags):
+    """키와 플래그를 다시 규칙 문법 문자열로 복원합니다."""
+    domain = '.'.join(reversed(key.decode('utf-8').split('.')))
+    allow = flags & (ALLOW_SELF | ALLOW_SUB)
+    if allow:
+        flags = allow >> 2
+    rule = domain if flags & BLOCK_SELF else '*.' + domain
+    return '@@' + rule if allow else rule
+
+
+def read_delta(lines):
+    """델타 줄들을 키별 (추가 플래그, 제거 플래그) 로 정리해 키 순서로 반환합니다.
+
+    같은 규칙이 여러 번 나오면 마지막 줄이 우선합니다.
+    """
+    changes = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        op, rule = line[0], line[1:]
+        if op not in '+-':
+            raise ValueError(f"델타 줄은 '+' 또는 '-' 로 시작해야 합니다: {line}")
+        key, flags = parse_rule(rule)
+        add, remove = changes.get(key, (0, 0))
+        if op == '+':
+            add, remove = add | flags, remove & ~flags
+        else:
+            add, remove = add & ~flags, remove | flags
+        changes[key] = (add, remove)
+    return sorted((key, add, remove) for key, (add, remove) in changes.items())
+
+
+def merge_delta(entries, changes):
+    """정렬된 (키, 플래그) 스트림에 read_delta 결과를 병합합니다."""
+    changes = iter(changes)
+    change = next(changes, None)
+    for key, flags in entries:
+        while change is not None and change[0] < key:
+            if change[1]:
+                yield change[0], change[1]
+            change = next(changes, None)
+        if change is not None and change[0] == key:
+            flags = (flags & ~change[2]) | change[1]
+            change = next(changes, None)
+        if flags:
+            yield key, flags
+    while change is not None:
+        if change[1]:
+            yield change[0], change[1]
+        change = next(changes, None)
+
+
+def write_entries(entries, index_path, db_version):
+    """정렬된 (키, 플래그) 스트림을 인덱스 파일로 기록합니다.
+
+    entries 는 호출할 때마다 같은 스트림을 새로 만드는 함수입니다.
+    오프셋/플래그 테이블과 키 blob 을 두 번에 나누어 쓰므로, 수백만 개의
+    키를 한꺼번에 메모리에 올리지 않습니다.
+    임시 파일에 쓴 뒤 os.replace 로 교체하므로, 여러 워커가 동시에
+    빌드하거나 읽는 중이어도 반쯤 쓰인 파일을 보는 일이 없습니다.
+    """
+    offsets = array('I', [0])
+    flags = bytearray()
+    for key, key_flags in entries():
+        offsets.append(offsets[-1] + len(key))
+        flags.append(key_flags)
+    count = len(flags)
+
+    directory = os.path.dirname(os.path.abspath(index_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, count, db_version))
+            offsets.tofile(f)
+            f.write(flags)
+            for key, _ in entries():
+                f.write(key)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return count
+
+
+def write_index(rules, index_path, db_version=1):
+    """규칙 목록을 정렬해 인덱스 파일로 기록합니다.
+
+    같은 도메인에 대한 규칙들은 플래그를 합쳐 하나의 키로 저장합니다.
+    """
+    merged = {}
+    for rule in rules:
+        key, flags = parse_rule(rule)
+        merged[key] = merged.get(key, 0) | flags
+    keys = sorted(merged)
+    return write_entries(lambda: ((key, merged[key]) for key in keys), index_path, db_version)
+
+
+def next_db_version(index_path):
+    """기존 인덱스 파일의 다음 db_version 을 반환합니다 (없으면 1)."""
+    try:
+        with open(index_path, 'rb') as f:
+            magic, fmt, _, db_version = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return 1
+    if magic != MAGIC or fmt != FORMAT_VERSION:
+        return 1
+    return db_version + 1
+
+
+@contextmanager
+def index_lock(index_path):
+    """인덱스를 읽고-수정하고-교체하는 구간을 프로세스 간에 직렬화합니다.
+
+    index_path + '.lock' 파일에 flock 을 겁니다. fcntl 이 없는 환경(Windows)
+    에서는 잠그지 않습니다.
+    """
+    if fcntl is None:
+        yield
+        return
+    directory = os.path.dirname(os.path.abspath(index_path))
+    os.makedirs(directory, exist_ok=True)
+    with open(index_path + '.lock', 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _build_index(source_path, index_path):
+    return write_index(read_rules(source_path), index_path, next_db_version(index_path))
+
+
+def build_index(source_path=DEFAULT_SOURCE, index_path=DEFAULT_INDEX):
+    """텍스트 DB 로부터 인덱스 파일을 생성하고 도메인 수를 반환합니다."""
+    with index_lock(index_path):
+        return _build_index(source_path, index_path)
+
+
+def apply_delta(lines, index_path=DEFAULT_INDEX):
+    """기존 인덱스에 델타를 병합해 새 버전의 인덱스 파일을 기록합니다.
+
+    텍스트 DB 전체를 다시 파싱하지 않고, 현재 인덱스와 정렬된 델타를
+    한 번에 병합합니다. 새 인덱스의 규칙 수를 반환합니다.
+    잠금을 잡은 뒤 현재 인덱스를 열므로, 다른 프로세스가 먼저 적용한
+    델타 위에 이어서 병합합니다.
+    """
+    changes = read_delta(lines)
+    with index_lock(index_path):
+        index = PhishingIndex(index_path)
+        return write_entries(lambda: merge_delta(index.entries(), changes),
+                             index_path, index.db_version + 1)
+
+
+class PhishingIndex:
+    """mmap 된 인덱스 파일에 대한 읽기 전용 조회 객체."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, fmt, count, db_version = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"지원하지 않는 인덱스 파일입니다: {path}")
+
+        start = HEADER.size
+        end = start + (count + 1) * 4
+        self._offsets = memoryview(self._mm)[start:end].cast('I')
+        self._flags = memoryview(self._mm)[end:end + count]
+        self._blob_start = end + count
+        self.path = path
+        self.count = count
+        self.db_version = db_version
+        # 최상위 라벨(TLD)별 탐색 결과 캐시. 가장 넓은 구간의 이진 탐색을
+        # 매번 반복하지 않도록 합니다. 인덱스에 실제로 있는 TLD 만 저장하므로
+        # 조회하는 호스트(사용자 입력, 원격 Location 헤더)와 관계없이 크기가 제한됩니다.
+        self._top_level = {}
+
+    def __len__(self):
+        return self.count
+
+    def _key(self, i):
+        base = self._blob_start
+        return self._mm[base + self._offsets[i]:base + self._offsets[i + 1]]
+
+    def entries(self):
+        """저장된 (키, 플래그) 를 키 순서대로 반환합니다."""
+        for i in range(self.count):
+            yield self._key(i), self._flags[i]
+
+    def _bisect(self, key, lo, hi):
+        mm, offsets, base = self._mm, self._offsets, self._blob_start
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if mm[base + offsets[mid]:base + offsets[mid + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def match(self, host):
+        """호스트 또는 상위 도메인에 해당하는 가장 구체적인 규칙을 찾습니다.
+
+        TLD 부터 한 라벨씩 내려가며, 매 단계마다 탐색 범위를 현재 키의
+        하위 도메인 구간으로 좁힙니다. 더 깊은 규칙이 얕은 규칙보다,
+        같은 깊이에서는 허용 규칙이 차단 규칙보다 우선합니다.
+        일치하는 규칙이 없으면 None 을 반환합니다.
+        """
+        labels = host.lower().strip('.').split('.')
+        lo, hi = 0, self.count
+        best = None
+        key = b''
+        for depth, label in enumerate(reversed(labels)):
+            key = key + b'.' + label.encode('utf-8') if depth else label.encode('utf-8')
+            is_host = depth == len(labels) - 1
+
+            if depth == 0:
+                top = self._top_level.get(key)
+                if top is None:
+                    pos = self._bisect(key, lo, hi)
+                    sub_lo = self._bisect(key + b'.', pos, hi)
+                    top = (pos, sub_lo, self._bisect(key + b'/', sub_lo, hi))
+                    if top[1] < top[2] or (pos < hi and self._key(pos) == key):
+                        self._top_level[key] = top
+                pos, sub_lo, sub_hi = top
+            else:
+                pos = self._bisect(key, lo, hi)
+                sub_lo = sub_hi = None
+
+            if pos < hi and self._key(pos) == key:
+                flags = self._flags[pos]
+                allow, block = (ALLOW_SELF, BLOCK_SELF) if is_host else (ALLOW_SUB, BLOCK_SUB)
+                if flags & allow:
+                    best = Match(format_rule(key, flags & (ALLOW_SELF | ALLOW_SUB)), True)
+                elif flags & block:
+                    best = Match(format_rule(key, flags & (BLOCK_SELF | BLOCK_SUB)), False)
+            if is_host:
+                break
+
+            # 다음 라벨은 "<key>." 로 시작하는 구간에만 존재합니다.
+            if sub_lo is None:
+                sub_lo = self._bisect(key + b'.', pos, hi)
+                sub_hi = self._bisect(key + b'/', sub_lo, hi)
+            lo, hi = sub_lo, sub_hi
+            if lo == hi:
+                break
+        return best
+
+    def __contains__(self, domain):
+        match = self.match(domain)
+        return match is not None and not match.allowed
+
+
+def load_index(source_path=DEFAULT_SOURCE, index_path=DEFAULT_INDEX):
+    """인덱스를 열어 반환합니다.
+
+    인덱스 파일이 없거나, 텍스트 DB 보다 오래되었거나, 이전 형식인 경우
+    먼저 빌드합니다. 둘 다 없으면 None 을 반환합니다.
+    """
+    has_source = os.path.exists(source_path)
+    if has_source:
+        # 여러 워커가 동시에 시작해도 한 번만 빌드하도록 잠금 안에서 다시 확인합니다.
+        with index_lock(index_path):
+            if (not os.path.exists(index_path)
+                    or os.path.getmtime(index_path) < os.path.getmtime(source_path)):
+                _build_index(source_path, index_path)
+    if not os.path.exists(index_path):
+        return None
+    try:
+        return PhishingIndex(index_path)
+    except ValueError:
+        if not has_source:
+            raise
+        with index_lock(index_path):
+            try:
+                return PhishingIndex(index_path)
+            except ValueError:
+                _build_index(source_path, index_path)
+        return PhishingIndex(index_path)
+
+
+class PhishingDB:
+    """워커에서 사용하는 피싱 DB 핸들. 인덱스 교체를 감지해 핫 리로드합니다.
+
+    조회는 현재 PhishingIndex 참조를 한 번 읽어 그 객체만 사용하고,
+    리로드는 새 인덱스를 완전히 연 뒤 참조를 한 번에 바꿉니다. 따라서
+    진행 중인 조회는 항상 온전한 이전 버전 또는 새 버전만 봅니다.
+    이전 버전의 mmap 은 마지막 참조가 사라질 때 해제됩니다.
+
+    check_interval 초마다 조회 경로에서 인덱스 파일의 stat 을 확인하며
+    (0 이면 감시 안 함), 다른 프로세스가 build/delta 로 파일을 교체하면
+    다음 조회 때 새 버전을 엽니다.
+    """
+
+    def __init__(self, source_path=DEFAULT_SOURCE, index_path=DEFAULT_INDEX, check_interval=5.0):
+        self.source_path = source_path
+        self.index_path = index_path
+        self.check_interval = check_interval
+        self.history = deque(maxlen=20)
+        self._index = None
+        self._stat = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        index = self._index
+        return index.db_version if index is not None else None
+
+    def __len__(self):
+        index = self._index
+        return len(index) if index is not None else 0
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.index_path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _swap(self, index, stat, trigger, started):
+        self._index = index
+        self._stat = stat
+        record = {
+            'version': index.db_version,
+            'count': len(index),
+            'load_ms': round((time.perf_counter() - started) * 1000, 2),
+            'loaded_at': time.time(),
+            'trigger': trigger,
+        }
+        self.history.append(record)
+        print(f"Loaded phishing DB v{record['version']}: {record['count']} rules "
+              f"in {record['load_ms']}ms ({trigger})")
+        return record
+
+    def load(self, trigger='startup'):
+        """인덱스를 (필요하면 빌드 후) 열어 교체합니다. 인덱스가 없으면 None."""
+        started = time.perf_counter()
+        with self._lock:
+            index = load_index(self.source_path, self.index_path)
+            if index is None:
+                return None
+            return self._swap(index, self._file_stat(), trigger, started)
+
+    def reload(self, trigger='manual'):
+        """디스크의 인덱스 파일을 다시 엽니다."""
+        started = time.perf_counter()
+        with self._lock:
+            stat = self._file_stat()
+            return self._swap(PhishingIndex(self.index_path), stat, trigger, started)
+
+    def rebuild(self):
+        """텍스트 DB 전체로 인덱스를 다시 빌드하고 교체합니다."""
+        started = time.perf_counter()
+        with self._lock:
+            build_index(self.source_path, self.index_path)
+            return self._swap(PhishingIndex(self.index_path), self._file_stat(), 'rebuild', started)
+
+    def apply_delta(self, lines):
+        """델타를 인덱스 파일에 병합하고 새 버전으로 교체합니다."""
+        started = time.perf_counter()
+        with self._lock:
+            apply_delta(lines, self.index_path)
+            return self._swap(PhishingIndex(self.index_path), self._file_stat(), 'delta', started)
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if not self.check_interval or now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        stat = self._file_stat()
+        if stat is None or stat == self._stat or not self._lock.acquire(blocking=False):
+            return
+        try:
+            started = time.perf_counter()
+            self._swap(PhishingIndex(self.index_path), stat, 'watch', started)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not reload phishing database: {e}")
+            self._stat = stat
+        finally:
+            self._lock.release()
+
+    def refresh(self):
+        """인덱스 파일이 교체되었는지 확인해 (check_interval 마다) 새 버전으로 전환합니다.
+
+        조회 없이 version 만 읽는 곳(예: 결과 캐시 키)에서 호출합니다.
+        """
+        self._maybe_reload()
+
+    def match(self, host):
+        """현재 버전의 인덱스로 PhishingIndex.match 를 수행합니다."""
+        self._maybe_reload()
+        index = self._index
+        if index is None:
+            return None
+        return index.match(host)
+
+
+def main(argv):
+    if len(argv) >= 1 and argv[0] == 'build':
+        source_path = argv[1] if len(argv) > 1 else DEFAULT_SOURCE
+        index_path = argv[2] if len(argv) > 2 else DEFAULT_INDEX
+        count = build_index(source_path, index_path)
+        print(f"Built {index_path} with {count} phishing domains.")
+        return 0
+    if len(argv) >= 2 and argv[0] == 'delta':
+        index_path = argv[2] if len(argv) > 2 else DEFAULT_INDEX
+        with open(argv[1], 'r', encoding='utf-8') as f:
+            count = apply_delta(f, index_path)
+        print(f"Applied {argv[1]} to {index_path}: {count} phishing domains.")
+        return 0
+    print(__doc__)
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,164 @@
+"""URL 검사 결과 캐시
+
+스팸 문자로 같은 단축 URL 이 수천 번 들어오는 경우, 매번 네트워크로 확장하고
+다시 검사하지 않도록 정규화된 URL 을 키로 결과를 캐시합니다.
+
+- 워커 내 LRU + TTL 캐시 (크기 제한, 오래된 항목부터 제거)
+- 성공한 결과와 실패(DNS 오류, 타임아웃 등)에 서로 다른 TTL 적용 (네거티브 캐싱)
+- 키에 피싱 DB 버전을 포함하므로, DB 가 갱신되면 이전 결과는 더 이상 조회되지 않음
+- REDIS_URL 이 설정되어 있고 redis 패키지가 설치되어 있으면 모든 워커가
+  공유하는 Redis 캐시를 함께 사용 (선택 사항)
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """캐시 키용으로 URL 을 정규화합니다.
+
+    검사 결과를 바꿀 수 없는 부분만 정규화합니다: 스킴/호스트 소문자화, 기본 포트와
+    프래그먼트(서버로 전송되지 않음) 제거, 빈 경로는 '/' 로 바꿉니다.
+    사용자 정보(user@), 호스트 끝의 '.', 경로와 쿼리는 결과에 영향을 줄 수 있으므로
+    그대로 둡니다.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    userinfo, at, hostport = parts.netloc.rpartition('@')
+    host = parts.hostname or ''
+    if ':' in host:
+        host = f"[{host}]"
+    try:
+        port = parts.port
+        netloc = host if port is None or port == DEFAULT_PORTS.get(scheme) else f"{host}:{port}"
+    except ValueError:
+        # 잘못된 포트는 확장 결과(오류)가 달라지므로 그대로 둡니다.
+        netloc = hostport.lower()
+    return urlunsplit((scheme, userinfo + at + netloc, parts.path or '/', parts.query, ''))
+
+
+class LRUCache:
+    """스레드 안전한 LRU 캐시. 항목마다 만료 시각(ttl)을 지정할 수 있습니다."""
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class ResultCache:
+    """URL 검사 결과 캐시 (워커 내 LRU + 선택적 Redis 공유 캐시).
+
+    값은 JSON 으로 직렬화 가능한 dict 여야 하며, 결과에 'error' 가 있으면
+    실패로 보고 failure_ttl 을 적용합니다.
+    """
+
+    def __init__(self, maxsize=10000, success_ttl=600, failure_ttl=60, redis_url=None, prefix='0room:url:'):
+        self.success_ttl = success_ttl
+        self.failure_ttl = failure_ttl
+        self.prefix = prefix
+        self._local = LRUCache(maxsize)
+        self._shared = None
+        if redis_url:
+            if redis is None:
+                print("Warning: REDIS_URL is set but the redis package is not installed.")
+            else:
+                self._shared = redis.Redis.from_url(redis_url, socket_timeout=0.2)
+        self._version = None
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.shared_errors = 0
+
+    def _key(self, url, version):
+        return f"{self.prefix}{version}:{normalize_url(url)}"
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, url, version):
+        """캐시된 결과를 반환합니다. 없으면 None."""
+        if version != self._version:
+            # 이전 버전의 항목은 더 이상 조회되지 않으므로 바로 비웁니다.
+            self._version = version
+            self._local.clear()
+
+        key = self._key(url, version)
+        value = self._local.get(key)
+        if value is not None:
+            self._count('hits')
+            return value
+
+        if self._shared is not None:
+            try:
+                raw = self._shared.get(key)
+            except redis.RedisError:
+                self._count('shared_errors')
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                ttl = self.failure_ttl if value.get('error') else self.success_ttl
+                self._local.set(key, value, ttl)
+                self._count('shared_hits')
+                return value
+
+        self._count('misses')
+        return None
+
+    def set(self, url, version, value):
+        key = self._key(url, version)
+        ttl = self.failure_ttl if value.get('error') else self.success_ttl
+        self._local.set(key, value, ttl)
+        if self._shared is not None:
+            try:
+                self._shared.setex(key, ttl, json.dumps(value))
+            except redis.RedisError:
+                self._count('shared_errors')
+
+    def stats(self):
+        return {
+            'size': len(self._local),
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'shared_errors': self.shared_errors,
+            'shared': self._shared is not None
+        }
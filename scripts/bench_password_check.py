@@ -0,0 +1,103 @@
+"""/api/password-check 벤치마크
+
+gunicorn(gunicorn.conf.py 설정)을 직접 띄워 다음을 측정합니다.
+- 시작부터 첫 응답까지 걸린 시간
+- 워커 전용(private) 메모리 합계 (/proc/<pid>/smaps_rollup)
+- 반복 입력이 섞인 요청에 대한 초당 처리량(req/s)
+
+사용법:
+    python scripts/bench_password_check.py [요청 수] [동시 연결 수]
+    GUNICORN_PRELOAD=0 python scripts/bench_password_check.py   # preload 끄고 비교
+    PASSWORD_CACHE_SIZE=0 python scripts/bench_password_check.py  # 결과 캐시 끄고 비교
+"""
+import http.client
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 8099
+WORKERS = 4
+
+
+def private_kb(pid):
+    total = 0
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            if line.startswith(('Private_Clean', 'Private_Dirty')):
+                total += int(line.split()[1])
+    return total
+
+
+def worker_pids(master_pid):
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def post(conn, password):
+    body = json.dumps({'password': password})
+    conn.request('POST', '/api/password-check', body, {'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    response.read()
+    return response.status
+
+
+def main(total, concurrency):
+    rng = random.Random(0)
+    common = ['password', '123456', 'qwerty123', 'iloveyou', 'dragon2024', 'letmein!', 'P@ssw0rd']
+    distinct = common + [''.join(rng.choices(string.ascii_letters + string.digits + '!@#$', k=rng.randint(8, 30)))
+                         for _ in range(100 - len(common))]
+    workload = [rng.choice(distinct) for _ in range(total)]
+
+    env = dict(os.environ, PORT=str(PORT), WEB_CONCURRENCY=str(WORKERS))
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'app:app'], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                conn = http.client.HTTPConnection('127.0.0.1', PORT, timeout=5)
+                post(conn, 'warmup')
+                conn.close()
+                break
+            except OSError:
+                time.sleep(0.01)
+        first_response = time.perf_counter() - started
+        time.sleep(1)
+        pids = worker_pids(server.pid)
+        memory = sum(private_kb(pid) for pid in pids) / 1024
+
+        chunks = [workload[i::concurrency] for i in range(concurrency)]
+
+        def run(chunk):
+            conn = http.client.HTTPConnection('127.0.0.1', PORT, timeout=30)
+            for password in chunk:
+                post(conn, password)
+            conn.close()
+
+        threads = [threading.Thread(target=run, args=(chunk,)) for chunk in chunks]
+        t = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - t
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"preload={os.environ.get('GUNICORN_PRELOAD', 'default')} "
+          f"cache={os.environ.get('PASSWORD_CACHE_SIZE', 'default')} workers={len(pids)}")
+    print(f"first response   {first_response * 1000:8.0f} ms")
+    print(f"worker private   {memory:8.1f} MiB (total)")
+    print(f"throughput       {total / elapsed:8.0f} req/s ({total} requests, {concurrency} connections)")
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:]]
+    main(args[0] if args else 2000, args[1] if len(args) > 1 else 8)
@@ -0,0 +1,102 @@
+"""피싱 DB 로더 비교 벤치마크: 기존 set 로더 vs mmap 인덱스
+
+합성 도메인 목록(기본 50만 / 500만 개)을 만들고, 각 방식을 별도 프로세스에서
+로드하여 시작 시간, 워커 전용(private) 메모리, 조회 시간을 비교합니다.
+mmap 인덱스의 페이지는 파일 기반 공유 메모리이므로 private 에 잡히지 않습니다.
+
+사용법:
+    python scripts/bench_phishing_index.py [개수 ...]
+"""
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from phishing_index import build_index  # noqa: E402
+
+WORKER = r'''
+import os, sys, time
+sys.path.insert(0, {root!r})
+
+def private_kb():
+    total = 0
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            if line.startswith(('Private_Clean', 'Private_Dirty')):
+                total += int(line.split()[1])
+    return total
+
+mode, source, index, probes = sys.argv[1:5]
+probes = open(probes).read().split()
+base = private_kb()
+t = time.perf_counter()
+if mode == 'set':
+    db = set()
+    with open(source, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                db.add(line.lower())
+else:
+    from phishing_index import PhishingIndex
+    db = PhishingIndex(index)
+load = time.perf_counter() - t
+mem = private_kb() - base
+t = time.perf_counter()
+hits = sum(1 for p in probes if p in db)
+lookup = (time.perf_counter() - t) / len(probes)
+print(load, mem, lookup * 1e6, hits)
+'''
+
+
+def make_domains(n, rng):
+    tlds = ['com', 'net', 'org', 'xyz', 'top', 'info', 'co.kr', 'ru']
+    for _ in range(n):
+        name = ''.join(rng.choices(string.ascii_lowercase + string.digits, k=rng.randint(6, 18)))
+        yield f"{name}.{rng.choice(tlds)}"
+
+
+def run(mode, source, index, probes):
+    out = subprocess.run(
+        [sys.executable, '-c', WORKER.format(root=ROOT), mode, source, index, probes],
+        check=True, capture_output=True, text=True).stdout.split()
+    return float(out[0]), int(out[1]), float(out[2]), int(out[3])
+
+
+def bench(n):
+    rng = random.Random(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'phishing_db.txt')
+        index = os.path.join(tmp, 'phishing_db.idx')
+        probes = os.path.join(tmp, 'probes.txt')
+        sample = []
+        with open(source, 'w', encoding='utf-8') as f:
+            for i, domain in enumerate(make_domains(n, rng)):
+                f.write(domain + '\n')
+                if i % (n // 5000) == 0:
+                    sample.append(domain)
+        sample += list(make_domains(len(sample), rng))
+        with open(probes, 'w') as f:
+            f.write('\n'.join(sample))
+
+        t = time.perf_counter()
+        build_index(source, index)
+        build_time = time.perf_counter() - t
+
+        print(f"\n== {n:,} domains (index {os.path.getsize(index) / 2**20:.1f} MiB, "
+              f"build {build_time:.2f}s) ==")
+        print(f"{'loader':<8}{'startup':>12}{'private mem':>16}{'lookup':>12}")
+        for mode in ('set', 'mmap'):
+            load, mem, lookup, _ = run(mode, source, index, probes)
+            print(f"{mode:<8}{load * 1000:>10.1f}ms{mem / 1024:>13.1f}MiB{lookup:>10.2f}us")
+
+
+if __name__ == '__main__':
+    for n in [int(a) for a in sys.argv[1:]] or [500_000, 5_000_000]:
+        bench(n)
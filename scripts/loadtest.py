@@ -0,0 +1,274 @@
+"""로컬 부하 테스트: 모든 API 라우트의 p50/p99 지연 시간과 처리량
+
+인터넷 없이 실행할 수 있도록 리다이렉트 대상이 되는 스텁 HTTP 서버를 함께 띄웁니다.
+스텁 서버는 /chain/<n> 으로 요청받으면 n 번 리다이렉트한 뒤 200 으로 응답하며,
+쿼리로 hop 마다의 지연(delay, ms)과 최종 응답 본문 크기(size, bytes)를 지정합니다.
+head=0 이면 HEAD 에 405 를 돌려줘 GET 재시도 경로를 검사합니다.
+
+gunicorn(gunicorn.conf.py 설정)을 직접 띄워 라우트마다 동시 연결 수만큼 keep-alive
+연결로 요청을 보내고, 끝나면 /metrics 의 단계별 평균 시간도 함께 출력합니다.
+
+사용법:
+    python scripts/loadtest.py                         # 기본 설정
+    python scripts/loadtest.py --hops 5 --delay 20 --size 1000000 -c 16 -n 400
+    python scripts/loadtest.py --target http://127.0.0.1:8000 --admin-token TOKEN
+"""
+import argparse
+import collections
+import http.client
+import http.server
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from url_tracer import ERROR_BUSY  # noqa: E402
+
+STUB_PORT = 8098
+APP_PORT = 8097
+ADMIN_TOKEN = 'loadtest'
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """/chain/<n>?delay=<ms>&size=<bytes>&head=0|1 에 응답하는 리다이렉트 스텁."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self, send_body):
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        time.sleep(int(query.get('delay', 0)) / 1000)
+        if not send_body and query.get('head') == '0':
+            self.send_response(405)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        segments = parts.path.strip('/').split('/')
+        remaining = int(segments[1]) if len(segments) > 1 and segments[0] == 'chain' else 0
+        if remaining > 0:
+            self.send_response(302)
+            location = f"/chain/{remaining - 1}"
+            self.send_header('Location', f"{location}?{parts.query}" if parts.query else location)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        size = int(query.get('size', 0))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(size))
+        self.end_headers()
+        if send_body:
+            chunk = b'x' * 65536
+            try:
+                while size > 0:
+                    self.wfile.write(chunk[:size])
+                    size -= len(chunk)
+            except (BrokenPipeError, ConnectionResetError):
+                # 트레이서는 본문을 읽지 않고 연결을 끊습니다.
+                pass
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(port):
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_app(port, workers):
+    env = dict(os.environ, PORT=str(port), WEB_CONCURRENCY=str(workers), ADMIN_TOKEN=ADMIN_TOKEN)
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'app:app'], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/metrics')
+            conn.getresponse().read()
+            conn.close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.terminate()
+    raise RuntimeError("gunicorn 이 시작되지 않았습니다.")
+
+
+def scenarios(args):
+    """(이름, 메서드, 경로, 요청 i 의 (본문, 헤더)를 만드는 함수) 목록."""
+    rng = random.Random(0)
+    passwords = ['password', '123456', 'qwerty123', 'iloveyou', 'P@ssw0rd'] + [
+        ''.join(rng.choices(string.ascii_letters + string.digits + '!@#$', k=rng.randint(8, 30)))
+        for _ in range(195)]
+    stub = f"http://localhost:{args.stub_port}/chain/{args.hops}?delay={args.delay}&size={args.size}&head={args.head}"
+    run_id = f"{time.time():.0f}"
+    admin = {'X-Admin-Token': args.admin_token}
+
+    def json_body(value):
+        return json.dumps(value), {'Content-Type': 'application/json'}
+
+    return [
+        ('password-check', 'POST', '/api/password-check',
+         lambda i: json_body({'password': passwords[i % len(passwords)]})),
+        # 매번 다른 URL 이라 캐시를 거치지 않고 실제로 확장합니다.
+        ('url-expander', 'POST', '/api/url-expander',
+         lambda i: json_body({'url': f"{stub}&run={run_id}&i={i}"})),
+        ('url-expander (cached)', 'POST', '/api/url-expander',
+         lambda i: json_body({'url': f"{stub}&run={run_id}&cached"})),
+        ('url-expander/batch', 'POST', '/api/url-expander/batch',
+         lambda i: json_body({'urls': [f"{stub}&run={run_id}&b={i}-{j}" for j in range(args.batch)]})),
+        ('admin/phishing-db', 'GET', '/api/admin/phishing-db', lambda i: (None, admin)),
+        ('admin/phishing-db/reload', 'POST', '/api/admin/phishing-db/reload',
+         lambda i: (None, admin)),
+        ('admin/url-cache', 'GET', '/api/admin/url-cache', lambda i: (None, admin)),
+        ('metrics', 'GET', '/metrics', lambda i: (None, {})),
+    ]
+
+
+def classify(response, data):
+    """응답을 'ok', 'busy'(동시 확장 한도 초과로 거절), 'error' 로 분류합니다.
+
+    JSON/NDJSON 응답은 모든 결과의 error 가 비어 있어야 'ok' 입니다.
+    """
+    if response.status == 503:
+        return 'busy'
+    if response.status != 200:
+        return 'error'
+    if 'json' not in response.getheader('Content-Type', ''):
+        return 'ok'
+    errors = [json.loads(line).get('error') for line in data.splitlines() if line.strip()]
+    if any(error == ERROR_BUSY for error in errors):
+        return 'busy'
+    return 'error' if any(errors) else 'ok'
+
+
+def run_scenario(host, port, method, path, make_request, total, concurrency):
+    """요청 total 개를 concurrency 개 연결로 보내 (지연 시간 목록, 분류별 개수, 경과 시간)을 반환합니다."""
+    latencies = []
+    outcomes = collections.Counter()
+    lock = threading.Lock()
+    indexes = iter(range(total))
+
+    def run():
+        conn = http.client.HTTPConnection(host, port, timeout=60)
+        while True:
+            with lock:
+                i = next(indexes, None)
+            if i is None:
+                break
+            body, headers = make_request(i)
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body, headers)
+                response = conn.getresponse()
+                data = response.read()
+                outcome = classify(response, data)
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=60)
+                outcome = 'error'
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                outcomes[outcome] += 1
+        conn.close()
+
+    threads = [threading.Thread(target=run) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, outcomes, time.perf_counter() - started
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def stage_summary(host, port):
+    """/metrics 에서 단계별 호출 수와 평균 시간을 읽습니다."""
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    conn.request('GET', '/metrics')
+    text = conn.getresponse().read().decode()
+    conn.close()
+    sums, counts = {}, {}
+    for line in text.splitlines():
+        if line.startswith('zeroroom_stage_duration_seconds_sum'):
+            stage = line.split('"')[1]
+            sums[stage] = float(line.rsplit(' ', 1)[1])
+        elif line.startswith('zeroroom_stage_duration_seconds_count'):
+            stage = line.split('"')[1]
+            counts[stage] = int(line.rsplit(' ', 1)[1])
+    return [(stage, counts[stage], sums[stage] / counts[stage] * 1000) for stage in sorted(counts) if counts[stage]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-n', '--requests', type=int, default=200, help="라우트별 요청 수")
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help="동시 연결 수")
+    parser.add_argument('--hops', type=int, default=3, help="스텁 리다이렉트 횟수")
+    parser.add_argument('--delay', type=int, default=10, help="hop 마다의 스텁 응답 지연(ms)")
+    parser.add_argument('--size', type=int, default=100000, help="최종 응답 본문 크기(bytes)")
+    parser.add_argument('--head', type=int, choices=(0, 1), default=1, help="0 이면 HEAD 에 405 응답")
+    parser.add_argument('--batch', type=int, default=10, help="batch 요청당 URL 수")
+    parser.add_argument('--workers', type=int, default=2, help="gunicorn 워커 수")
+    parser.add_argument('--stub-port', type=int, default=STUB_PORT)
+    parser.add_argument('--target', help="이미 실행 중인 서버 주소 (예: http://127.0.0.1:8000)")
+    parser.add_argument('--admin-token', default=ADMIN_TOKEN)
+    parser.add_argument('routes', nargs='*', help="실행할 라우트 이름 (기본: 전체)")
+    args = parser.parse_args()
+
+    stub = start_stub(args.stub_port)
+    server = None
+    if args.target:
+        target = urlsplit(args.target)
+        host, port = target.hostname, target.port or 80
+    else:
+        host, port = '127.0.0.1', APP_PORT
+        server = start_app(port, args.workers)
+
+    try:
+        print(f"stub: {args.hops} hops x {args.delay} ms, body {args.size} bytes, head={args.head}; "
+              f"{args.requests} requests x {args.concurrency} connections per route")
+        print(f"{'route':26} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'busy':>6} {'errors':>7}")
+        for name, method, path, make_request in scenarios(args):
+            if args.routes and name not in args.routes:
+                continue
+            latencies, outcomes, elapsed = run_scenario(
+                host, port, method, path, make_request, args.requests, args.concurrency)
+            print(f"{name:26} {len(latencies) / elapsed:8.0f} {percentile(latencies, 0.5) * 1000:9.1f} "
+                  f"{percentile(latencies, 0.99) * 1000:9.1f} {outcomes['busy']:6} {outcomes['error']:7}")
+
+        print()
+        print(f"{'stage':26} {'count':>8} {'mean ms':>9}")
+        for stage, count, mean_ms in stage_summary(host, port):
+            print(f"{stage:26} {count:8} {mean_ms:9.2f}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        stub.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""URL 휴리스틱 규칙 엔진
+
+규칙 파일(data/heuristic_rules.txt)의 키워드 규칙을 하나의 정규식으로 컴파일해,
+URL 의 호스트·경로·쿼리를 한 번만 훑으며 모든 키워드를 동시에 검사합니다.
+키워드는 공통 접두사를 묶은 트라이 형태의 정규식으로 만들어, 각 위치에서 첫 글자로
+바로 분기하는 오토마톤처럼 동작합니다. 따라서 키워드 수가 늘어나도 검사 시간이 거의
+늘지 않습니다. 전방 탐색으로 모든 위치에서 검사하므로 겹치는 키워드(예: phishing 과
+phish)도 모두 발견됩니다. 정규식 규칙은 서로 가리지 않도록 규칙마다 따로 검사합니다.
+호스트 구조 검사(IP 주소, 퓨니코드/동형 문자, 과도한 하위 도메인 등)도 같은 호출에서
+함께 수행하며, 첫 번째 발견에서 멈추지 않고 모든 발견과 가중치 합계(점수)를 반환합니다.
+
+규칙 파일 형식 (한 줄에 하나, '#' 주석 허용):
+    <가중치> <범위> <패턴> [표시 문구]
+        범위: url | host | path | query  - 패턴은 키워드, 're:' 로 시작하면 정규식
+        범위: check                      - 패턴은 호스트 구조 검사 이름[:인자]
+    threshold <점수>                       - 이 점수 이상이면 '의심됨'
+"""
+import hashlib
+import ipaddress
+import os
+import re
+import socket
+import unicodedata
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+DEFAULT_RULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'heuristic_rules.txt')
+
+SCOPES = ('url', 'host', 'path', 'query')
+
+# 호스트 구조 검사 이름과 표시 문구
+CHECK_LABELS = {
+    'ip': "IP 주소 직접 사용",
+    'ipv6': "IPv6 주소 직접 사용",
+    'ip_encoded': "10진수/16진수/8진수로 인코딩된 IP 주소 사용",
+    'punycode': "국제화(퓨니코드) 도메인",
+    'homoglyph': "라틴 문자와 비슷한 다른 문자(동형 문자) 사용",
+    'deep_subdomain': "하위 도메인 단계가 지나치게 많음",
+    'userinfo': "URL 에 사용자 정보(@) 포함",
+}
+
+# 라틴 문자와 모양이 같은 키릴/그리스 문자
+CONFUSABLES = set('асеорхуіјѕԁӏһкмтвпаοеорτνκιυχ')
+HOMOGLYPH_SCRIPTS = {'CYRILLIC', 'GREEK'}
+
+NUMERIC_HOST = re.compile(r'[0-9a-fx.]+')
+
+# 발견 하나: 규칙 이름, 발견된 부분(host/path/query), 가중치, 표시 문구
+Hit = namedtuple('Hit', ['rule', 'component', 'weight', 'label'])
+# 검사 결과: 가중치 합계와 모든 발견 (가중치 높은 순)
+HeuristicResult = namedtuple('HeuristicResult', ['score', 'hits'])
+
+
+def _trie_regex(words):
+    """단어 목록을 공통 접두사로 묶은 정규식으로 만듭니다.
+
+    예: ['phish', 'phishing', 'free'] -> (?:free|phish(?:ing)?)
+    긴 단어가 먼저 일치하도록 탐욕적 선택(?)을 사용합니다.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+def _scripts(label):
+    scripts = set()
+    for ch in label:
+        if ch.isalpha():
+            scripts.add(unicodedata.name(ch, 'UNKNOWN').split()[0])
+    return scripts
+
+
+def _unicode_label(label):
+    """xn-- 라벨은 디코딩하고, 유니코드 라벨은 그대로 반환합니다 (ASCII 라벨은 None)."""
+    if label.startswith('xn--'):
+        try:
+            return label.encode('ascii').decode('idna')
+        except UnicodeError:
+            return label
+    if not label.isascii():
+        return label
+    return None
+
+
+class HeuristicEngine:
+    """규칙 목록을 하나의 정규식으로 컴파일한 URL 휴리스틱 검사기."""
+
+    def __init__(self, rules, threshold=1):
+        """rules 는 (가중치, 범위, 패턴, 표시 문구 또는 None) 목록입니다."""
+        self.threshold = threshold
+        self.version = None
+        self.checks = {}
+        self._patterns = []
+        self._keywords = {}
+        self._regexes = []
+        for weight, scope, pattern, label in rules:
+            if scope == 'check':
+                name, _, arg = pattern.partition(':')
+                if name not in CHECK_LABELS:
+                    raise ValueError(f"알 수 없는 검사입니다: {name}")
+                self.checks[name] = (weight, int(arg) if arg else None)
+                continue
+            if scope not in SCOPES:
+                raise ValueError(f"알 수 없는 범위입니다: {scope}")
+            index = len(self._patterns)
+            if pattern.startswith('re:'):
+                self._regexes.append((re.compile(pattern[3:]), index))
+                label = label or f"'{pattern[3:]}' 패턴 발견"
+            else:
+                pattern = pattern.lower()
+                self._keywords.setdefault(pattern, []).append(index)
+                label = label or f"'{pattern}' 키워드 발견"
+            self._patterns.append((pattern, scope, weight, label))
+        # 각 위치에서 가장 긴 키워드를 찾으므로, 그 키워드의 접두사인 키워드도 함께 발견으로 봅니다.
+        # (예: 'phishing' 이 일치하면 'phish' 도 일치)
+        self._keyword_hits = {
+            keyword: [index for prefix, indexes in self._keywords.items()
+                      if keyword.startswith(prefix) for index in indexes]
+            for keyword in self._keywords
+        }
+        # 전방 탐색(?=...)은 폭이 0 이라 매 위치에서 검사하므로 일치가 서로 겹칠 수 있습니다.
+        self._keyword_regex = re.compile(f"(?=({_trie_regex(self._keywords)}))") if self._keywords else None
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_RULES):
+        rules = []
+        threshold = 1
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for line in content.splitlines():
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = line.split(None, 3)
+            if fields[0] == 'threshold':
+                threshold = int(fields[1])
+                continue
+            if len(fields) < 3:
+                raise ValueError(f"잘못된 규칙입니다: {line}")
+            label = fields[3] if len(fields) > 3 else None
+            rules.append((int(fields[0]), fields[1], fields[2], label))
+        engine = cls(rules, threshold)
+        # 규칙이 바뀌면 검사 결과 캐시 키도 바뀌도록 규칙 파일 내용의 해시를 버전으로 사용
+        engine.version = hashlib.sha1(content.encode('utf-8')).hexdigest()[:8]
+        return engine
+
+    def _check_host(self, host, netloc):
+        """호스트 구조 검사를 수행해 해당하는 검사 이름 목록을 반환합니다."""
+        found = []
+        checks = self.checks
+
+        if '@' in netloc:
+            found.append('userinfo')
+
+        # 숫자/16진수 문자로만 된 호스트나 IPv6 만 IP 주소 후보로 봅니다.
+        if ':' in host or (NUMERIC_HOST.fullmatch(host) and any(ch.isdigit() for ch in host)):
+            try:
+                ip = ipaddress.ip_address(host)
+                found.append('ipv6' if ip.version == 6 else 'ip')
+                return found
+            except ValueError:
+                pass
+            try:
+                socket.inet_aton(host)
+                found.append('ip_encoded')
+                return found
+            except OSError:
+                pass
+
+        labels = host.split('.')
+        if 'deep_subdomain' in checks:
+            max_depth = checks['deep_subdomain'][1] or 4
+            if len(labels) - 2 > max_depth:
+                found.append('deep_subdomain')
+
+        if host.isascii() and 'xn--' not in host:
+            return found
+        for label in labels:
+            decoded = _unicode_label(label)
+            if decoded is None:
+                continue
+            if 'punycode' not in found:
+                found.append('punycode')
+            scripts = _scripts(decoded)
+            if (('LATIN' in scripts and scripts & HOMOGLYPH_SCRIPTS)
+                    or (scripts <= HOMOGLYPH_SCRIPTS and set(decoded) - {'-'} <= CONFUSABLES)):
+                if 'homoglyph' not in found:
+                    found.append('homoglyph')
+        return found
+
+    def scan(self, url):
+        """URL 을 한 번 훑어 모든 발견과 점수를 반환합니다."""
+        parts = urlsplit(url.strip().lower())
+        host = (parts.hostname or '').rstrip('.')
+        hits = []
+
+        for name in self._check_host(host, parts.netloc):
+            if name in self.checks:
+                hits.append(Hit(name, 'host', self.checks[name][0], CHECK_LABELS[name]))
+
+        if self._patterns:
+            # 구분자(\x00)로 이어 붙여 검사하고, 위치로 어느 부분인지 판별합니다.
+            path_start = len(host) + 1
+            query_start = path_start + len(parts.path) + 1
+            text = f"{host}\x00{parts.path}\x00{parts.query}"
+            matches = []
+            if self._keyword_regex is not None:
+                for m in self._keyword_regex.finditer(text):
+                    matches.append((m.start(), self._keyword_hits[m.group(1)]))
+            for regex, index in self._regexes:
+                for m in regex.finditer(text):
+                    matches.append((m.start(), (index,)))
+
+            seen = set()
+            for pos, indexes in matches:
+                component = 'host' if pos < path_start else 'path' if pos < query_start else 'query'
+                for index in indexes:
+                    pattern, scope, weight, label = self._patterns[index]
+                    if (scope == 'url' or scope == component) and (index, component) not in seen:
+                        seen.add((index, component))
+                        hits.append(Hit(pattern, component, weight, label))
+
+        hits.sort(key=lambda hit: -hit.weight)
+        return HeuristicResult(sum(hit.weight for hit in hits), hits)
+
+    def describe(self, result, limit=3):
+        """검사 결과를 '의심됨 (...)' 괄호 안에 들어갈 문구로 만듭니다."""
+        labels = [hit.label for hit in result.hits[:limit]]
+        if len(result.hits) > limit:
+            labels.append(f"외 {len(result.hits) - limit}건")
+        return f"{', '.join(labels)} · 점수 {result.score}"
@@ -0,0 +1,227 @@
+"""리다이렉트 추적 엔진
+
+단축 URL 의 리다이렉트를 한 단계(hop)씩 직접 따라가며 경로 전체를 기록합니다.
+
+- 각 hop 은 HEAD 로 먼저 요청하고, HEAD 를 지원하지 않는 서버에만 GET 으로
+  재시도합니다. 어느 쪽이든 응답 헤더만 읽고 본문은 절대 내려받지 않습니다
+  (악성 랜딩 페이지의 수 MB 본문 방지).
+- aiohttp 커넥터의 커넥션 풀로 keep-alive 연결을 재사용합니다.
+- 타임아웃은 요청마다 5초가 아니라 경로 전체에 대한 총 예산입니다.
+- hop 마다 DNS 조회와 새 연결(TCP+TLS) 수립에 걸린 시간을 함께 기록합니다.
+
+추적은 워커마다 하나씩 있는 전용 asyncio 이벤트 루프 스레드에서 실행됩니다.
+느린(tarpit) 대상이 많아도 동시 추적 수와 호스트별 연결 수가 제한되고,
+추적을 기다리며 블로킹되는 요청 스레드 수도 제한되므로 다른 라우트
+(예: /api/password-check)를 처리할 스레드가 항상 남습니다.
+"""
+import asyncio
+import concurrent.futures
+import os
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urljoin
+
+import aiohttp
+import yarl
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# HEAD 를 거부하거나 다르게 처리하는 서버가 흔히 돌려주는 상태 코드
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 501}
+
+ERROR_TIMEOUT = "사이트 응답 시간이 초과되었습니다. (Timeout)"
+ERROR_CONNECTION = "사이트에 접속할 수 없습니다. 도메인이 존재하지 않거나 서버가 다운되었습니다."
+ERROR_TOO_MANY_REDIRECTS = "리다이렉트 횟수가 너무 많습니다. (순환 참조 가능성)"
+ERROR_BUSY = "현재 검사 요청이 많습니다. 잠시 후 다시 시도해주세요."
+
+# hop 하나: 요청한 URL, 응답 상태 코드, 응답 헤더까지 걸린 시간(ms),
+# DNS 조회 시간(ms), 새 연결 수립 시간(ms, TLS 핸드셰이크 포함).
+# 캐시된 DNS 나 keep-alive 연결을 재사용했으면 dns_ms/connect_ms 는 None
+Hop = namedtuple('Hop', ['url', 'status_code', 'latency_ms', 'dns_ms', 'connect_ms'])
+# 추적 결과: hops 는 요청에 성공한 hop 목록, 오류가 없으면 error 는 None
+Trace = namedtuple('Trace', ['hops', 'final_url', 'status_code', 'error'])
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+class RedirectTracer:
+    """전용 이벤트 루프 스레드에서 동작하는 hop 단위 리다이렉트 추적기.
+
+    budget       경로 전체 시간 예산(초)
+    max_hops     최대 hop 수
+    concurrency  이벤트 루프에서 동시에 진행되는 추적 수
+    per_host     호스트별 최대 동시 연결 수
+    max_waiters  trace() 로 결과를 기다리며 블로킹될 수 있는 요청 스레드 수.
+                 초과하면 기다리지 않고 ERROR_BUSY 를 즉시 반환합니다.
+    """
+
+    def __init__(self, budget=5.0, max_hops=10, concurrency=50, per_host=4, max_waiters=6):
+        self.budget = budget
+        self.max_hops = max_hops
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self._waiters = threading.BoundedSemaphore(max_waiters)
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop = None
+
+    def _ensure_loop(self):
+        """이벤트 루프 스레드를 (포크 이후 프로세스마다) 한 번 시작합니다."""
+        if self._pid == os.getpid():
+            return self._loop
+        with self._lock:
+            if self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                thread = threading.Thread(target=self._run_loop, args=(loop, started),
+                                          name='url-tracer', daemon=True)
+                thread.start()
+                started.wait()
+                self._loop = loop
+                self._pid = os.getpid()
+        return self._loop
+
+    def _run_loop(self, loop, started):
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(self._setup())
+        started.set()
+        loop.run_forever()
+
+    @staticmethod
+    def _trace_config():
+        """요청마다 넘긴 dict(trace_request_ctx)에 DNS/연결 시간(초)을 누적하는 TraceConfig."""
+        async def dns_start(session, ctx, params):
+            ctx.dns_started = time.perf_counter()
+
+        async def dns_end(session, ctx, params):
+            ctx.dns_elapsed = time.perf_counter() - ctx.dns_started
+            timings = ctx.trace_request_ctx
+            timings['dns'] = timings.get('dns', 0) + ctx.dns_elapsed
+
+        async def connect_start(session, ctx, params):
+            ctx.connect_started = time.perf_counter()
+
+        async def connect_end(session, ctx, params):
+            # 연결 수립 구간에는 DNS 조회가 포함되므로 DNS 시간을 뺍니다.
+            elapsed = time.perf_counter() - ctx.connect_started - getattr(ctx, 'dns_elapsed', 0)
+            timings = ctx.trace_request_ctx
+            timings['connect'] = timings.get('connect', 0) + elapsed
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_dns_resolvehost_start.append(dns_start)
+        trace_config.on_dns_resolvehost_end.append(dns_end)
+        trace_config.on_connection_create_start.append(connect_start)
+        trace_config.on_connection_create_end.append(connect_end)
+        return trace_config
+
+    async def _setup(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        # 여러 사용자의 요청이 세션을 공유하므로 쿠키는 저장하지 않습니다.
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers={'User-Agent': USER_AGENT},
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trace_configs=[self._trace_config()],
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    def submit(self, url, started=None):
+        """추적을 이벤트 루프에 예약하고 concurrent.futures.Future 를 반환합니다.
+
+        started(threading.Event)를 넘기면 동시 추적 자리를 얻어 실제로 추적을
+        시작할 때 set 됩니다.
+        """
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self.trace_async(url, started), loop)
+
+    def acquire_waiter(self):
+        """결과를 기다릴 요청 스레드 자리를 예약합니다. 자리가 없으면 False."""
+        return self._waiters.acquire(blocking=False)
+
+    def release_waiter(self):
+        self._waiters.release()
+
+    def trace(self, url):
+        """동기 코드(Flask 뷰)에서 추적 결과를 기다려 반환합니다."""
+        if not self.acquire_waiter():
+            return Trace([], url, None, ERROR_BUSY)
+        started = threading.Event()
+        future = self.submit(url, started)
+        try:
+            # 루프 안에서 예산으로 끝나므로, 여유 시간은 스케줄링 지연 대비용입니다.
+            return future.result(timeout=self.budget + 1)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            # 동시 추적 자리를 기다리다 시간이 다 된 경우는 대상 사이트의 타임아웃이
+            # 아니므로 ERROR_BUSY 로 구분합니다 (결과 캐시에 저장되지 않음).
+            return Trace([], url, None, ERROR_TIMEOUT if started.is_set() else ERROR_BUSY)
+        finally:
+            self.release_waiter()
+
+    async def _request(self, url, deadline, timings):
+        """HEAD (필요하면 GET) 로 헤더만 받아 (상태 코드, Location) 을 반환합니다.
+
+        두 요청 모두 경로 전체 예산의 마감 시각(deadline)까지만 기다립니다.
+        DNS/연결 시간(초)은 timings dict 에 누적됩니다.
+        """
+        session = self._session
+        timeout = aiohttp.ClientTimeout(total=deadline - time.monotonic())
+        async with session.head(url, allow_redirects=False, timeout=timeout,
+                                trace_request_ctx=timings) as response:
+            status, location = response.status, response.headers.get('Location')
+        if status in HEAD_FALLBACK_STATUSES:
+            # HEAD 에 쓴 시간을 빼고 남은 예산으로 GET 을 재시도합니다.
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            response = await session.get(url, allow_redirects=False,
+                                         timeout=aiohttp.ClientTimeout(total=remaining),
+                                         trace_request_ctx=timings)
+            try:
+                status, location = response.status, response.headers.get('Location')
+            finally:
+                # 본문을 읽지 않고 연결을 끊어 나머지를 받지 않습니다.
+                response.close()
+        return status, location
+
+    async def trace_async(self, url, started=None):
+        """url 에서 시작하는 리다이렉트 경로를 추적해 Trace 를 반환합니다."""
+        async with self._semaphore:
+            if started is not None:
+                started.set()
+            return await self._trace(url)
+
+    async def _trace(self, url):
+        deadline = time.monotonic() + self.budget
+        hops = []
+        visited = set()
+
+        try:
+            while True:
+                if url in visited or len(hops) >= self.max_hops:
+                    return Trace(hops, url, None, ERROR_TOO_MANY_REDIRECTS)
+                visited.add(url)
+
+                if deadline - time.monotonic() <= 0:
+                    return Trace(hops, url, None, ERROR_TIMEOUT)
+
+                started = time.monotonic()
+                timings = {}
+                status, location = await self._request(url, deadline, timings)
+                latency_ms = round((time.monotonic() - started) * 1000, 1)
+                hops.append(Hop(url, status, latency_ms, _ms(timings.get('dns')), _ms(timings.get('connect'))))
+
+                if status not in REDIRECT_STATUSES or not location:
+                    return Trace(hops, url, status, None)
+                # Location 헤더는 원격 사이트가 정한 값이므로 퍼센트 인코딩해 정규화합니다.
+                url = str(yarl.URL(urljoin(url, location)))
+        except asyncio.TimeoutError:
+            return Trace(hops, url, None, ERROR_TIMEOUT)
+        except aiohttp.ClientConnectionError:
+            return Trace(hops, url, None, ERROR_CONNECTION)
+        except Exception as e:
+            return Trace(hops, url, None, f"오류가 발생했습니다: {str(e)}")